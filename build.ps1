@@ -26,7 +26,7 @@ python -m pip install -r requirements.txt
 
 <# Сборка проекта с использованием Nuitka #>
 Write-Host "Building the project with Nuitka"
-python -m nuitka --standalone --show-progress --lto=yes --windows-icon-from-ico=d:\projects\Elixir\vendor\icon\logonew.ico --enable-plugin=pyqt6 --include-data-dir=vendor=vendor --include-data-dir=pic=pic --include-data-dir=images=images --include-data-dir=icon=icon --output-dir=$outputDir main.py
+python -m nuitka --standalone --show-progress --lto=yes --windows-icon-from-ico=d:\projects\Elixir\vendor\icon\logonew.ico --enable-plugin=pyqt6 --include-package=vendor.components --include-data-dir=vendor=vendor --include-data-dir=pic=pic --include-data-dir=images=images --include-data-dir=icon=icon --output-dir=$outputDir main.py
 
 <# Копирование необходимых папок в директорию сборки #>
 Write-Host "Copying necessary folders to the output directory"
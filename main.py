@@ -1,22 +1,14 @@
+import time
+_STARTUP_STARTED = time.perf_counter()
+
 from PyQt6.QtWidgets import (QApplication, QWidget, QPushButton, QLabel, QGridLayout,
                              QVBoxLayout, QHBoxLayout, QSpacerItem, QSizePolicy, QComboBox)
 from PyQt6.QtGui import QPixmap, QIcon, QPainter, QColor, QPainterPath, QScreen
-from PyQt6.QtCore import Qt, QSize, QRectF, QPoint
+from PyQt6.QtCore import Qt, QSize, QRectF, QPoint, QTimer
 from PyQt6.QtGui import QRegion
 from vendor.components.iconmanager import IconManager
-from vendor.components.qrcodewindow import QRCodeWindow
-from vendor.components.browser import Browser
-from vendor.components.speedtestwindow import SpeedTestWindow
-from vendor.components.screenrecoderwindow import ScreenRecorderWindow
-from vendor.components.screenshotwindow import ScreenshotWindow
-from vendor.components.screesharewindow import ScreenShareWindow
-from vendor.components.tranlatorwindow import TranslatorWindow
-from vendor.components.pcinfowindow import PCInfoWindow
-from vendor.components.paintwindow import PaintWindow
-from vendor.components.ai_chat import AIChatWindow
-from vendor.components.manager_download import Download_Manager
-from vendor.components.mic import AudioRecorder
-from vendor.components.mixerwindow import VolumeMixer
+from vendor.components.component_registry import ComponentRegistry
+from vendor.components import perf
 from thememanager import ThemeManager
 
 import sys
@@ -30,13 +22,40 @@ if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
 
 theme_manager = ThemeManager()
 
+# Модули окон импортируются при первом открытии (см. ComponentRegistry)
+COMPONENTS = {
+    "qr": ("vendor.components.qrcodewindow", "QRCodeWindow"),
+    "speedtest": ("vendor.components.speedtestwindow", "SpeedTestWindow"),
+    "paint": ("vendor.components.paintwindow", "PaintWindow"),
+    "pcinfo": ("vendor.components.pcinfowindow", "PCInfoWindow"),
+    "browser": ("vendor.components.browser", "Browser"),
+    "screenshot": ("vendor.components.screenshotwindow", "ScreenshotWindow"),
+    "recorder": ("vendor.components.screenrecoderwindow", "ScreenRecorderWindow"),
+    "screenshare": ("vendor.components.screesharewindow", "ScreenShareWindow"),
+    "translator": ("vendor.components.tranlatorwindow", "TranslatorWindow"),
+    "chat": ("vendor.components.ai_chat", "AIChatWindow"),
+    "audio_record": ("vendor.components.mic", "AudioRecorder"),
+    "mixer_value_audio": ("vendor.components.mixerwindow", "VolumeMixer"),
+}
+# QtWebEngine лучше инициализировать в главном потоке, поэтому браузер не прогревается в фоне
+PREWARM_COMPONENTS = [window_id for window_id in COMPONENTS if window_id != "browser"]
+PREWARM_DELAY = 1000  # мс после первого показа главного окна
+
+# ELIXIR_PERF=1 включает замеры горячих участков (см. vendor/components/perf.py);
+# ELIXIR_STARTUP_TIMING=1 выводит время до первой отрисовки и время импорта модулей окон;
+# подробный профиль импортов: python -X importtime main.py 2> importtime.log
+STARTUP_TIMING = os.environ.get("ELIXIR_STARTUP_TIMING") == "1"
+PREWARM = os.environ.get("ELIXIR_PREWARM", "1") != "0"
+
 class MainWindow(QWidget):
     def __init__(self, language, theme_manager, current_directory):
         super().__init__()
         self._old_pos = None
         self.language = language
         self.theme_manager = theme_manager
-        self.download_manager = Download_Manager()
+        self._download_manager = None
+        self.components = ComponentRegistry(COMPONENTS)
+        self._first_paint_done = False
         self._title_bar_buttons = []
         self.translations = self.load_translations(self.language)
         self.current_directory = current_directory
@@ -49,6 +68,13 @@ class MainWindow(QWidget):
         self.init_ui()
         self.setFixedSize(QSize(370, 700))
 
+    @property
+    def download_manager(self):
+        if self._download_manager is None:
+            from vendor.components.manager_download import Download_Manager
+            self._download_manager = Download_Manager()
+        return self._download_manager
+
     def load_translations(self, lang):
         with open(f"vendor/core/language/{lang}.json", "r", encoding="utf-8") as f:
             return json.load(f)
@@ -125,40 +151,38 @@ class MainWindow(QWidget):
         return grid
 
     def create_button(self, text, icon_name):
-        theme = self.theme_manager.theme_palette[self.theme]
         btn = QPushButton()
+        btn.setObjectName("GridButton")
         btn.setIcon(QIcon(IconManager.get_images(icon_name)))
         btn.setIconSize(QSize(64, 64))
         btn.setFixedSize(QSize(100, 100))
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background: {theme['bg']};
-                border-radius: 10px;
-                padding: 15px;
-                color: {theme['fg']};
-                font-size: 14px;
-                border: 0px solid {theme['border']};
-                text-align: center;
-            }}
-            QPushButton:hover {{ background: {theme['hover']}; }}
-            QPushButton:pressed {{ background: {theme['pressed']}; }}
-        """)
         return btn
 
     def update_theme(self, theme: str):
         self.theme = theme
-        theme_vals = self.theme_manager.theme_palette[self.theme]
-        self.setStyleSheet(f"""
+        # Стиль кнопок сетки задан в общем QSS окна, а не на каждой кнопке
+        self.theme_manager.apply_stylesheet(self, "MainWindow", self.build_stylesheet, theme)
+
+    @staticmethod
+    def build_stylesheet(theme_vals):
+        return f"""
             QWidget {{ background-color: {theme_vals['bg']}; color: {theme_vals['fg']}; font-family: 'Segoe UI'; font-size: 12pt; }}
             QComboBox {{ background: {theme_vals['hover']}; border: 1px solid {theme_vals['border']}; color: {theme_vals['fg']}; padding: 5px 10px; border-radius: 8px; min-width: 120px; }}
             QComboBox:hover {{ background: {theme_vals['bg']}; }}
             QComboBox::drop-down {{ border: none; width: 20px; }}
             QComboBox QAbstractItemView {{ background: {theme_vals['bg']}; color: {theme_vals['fg']}; selection-background-color: #ff4891; }}
-        """)
-
-        for btn in self.findChildren(QPushButton):
-            if btn not in self._title_bar_buttons:
-                btn.setStyleSheet(self.create_button("", "").styleSheet())
+            QPushButton#GridButton {{
+                background: {theme_vals['bg']};
+                border-radius: 10px;
+                padding: 15px;
+                color: {theme_vals['fg']};
+                font-size: 14px;
+                border: 0px solid {theme_vals['border']};
+                text-align: center;
+            }}
+            QPushButton#GridButton:hover {{ background: {theme_vals['hover']}; }}
+            QPushButton#GridButton:pressed {{ background: {theme_vals['pressed']}; }}
+        """
 
     def toggle_theme(self):
         new_theme = "dark" if self.theme_manager.current_theme() == "light" else "light"
@@ -210,6 +234,21 @@ class MainWindow(QWidget):
         p.fillPath(path, QColor(self.palette().color(self.backgroundRole())))
         p.setClipPath(path)
         super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            self._on_first_paint()
+
+    def _on_first_paint(self):
+        if STARTUP_TIMING:
+            print(f"Время до первой отрисовки: {(time.perf_counter() - _STARTUP_STARTED) * 1000:.0f} мс")
+        if PREWARM:
+            QTimer.singleShot(PREWARM_DELAY, lambda: self.components.prewarm(
+                PREWARM_COMPONENTS, self._report_load_times if STARTUP_TIMING else None
+            ))
+
+    def _report_load_times(self):
+        for window_id, seconds in sorted(self.components.load_times.items(), key=lambda item: -item[1]):
+            print(f"  {window_id}: {seconds * 1000:.0f} мс")
 
     def _cleanup_window(self, window_id):
         """Очистка ресурсов окна при его закрытии"""
@@ -225,9 +264,14 @@ class MainWindow(QWidget):
         """Обработчик закрытия окна"""
         self._cleanup_window(window_id)
 
-    def _create_window(self, window_id, window_class, *args, **kwargs):
-        """Создание нового окна с обработкой закрытия"""
+    def _create_window(self, window_id, window_class=None, *args, **kwargs):
+        """Создание нового окна с обработкой закрытия; класс берется из реестра компонентов"""
         if window_id not in self._open_windows:
+            if window_class is None:
+                started = time.perf_counter()
+                window_class = self.components.get(window_id)
+                if STARTUP_TIMING:
+                    print(f"Загрузка {window_id}: {(time.perf_counter() - started) * 1000:.0f} мс")
             window = window_class(*args, **kwargs)
             window.closeEvent = lambda event: self._handle_window_close(event, window_id)
             self._open_windows[window_id] = window
@@ -247,12 +291,12 @@ class MainWindow(QWidget):
         for window_id in list(self._open_windows.keys()):
             self._cleanup_window(window_id)
 
-        # Останавливаем таймер темы
-        self.theme_manager.timer.stop()
+        # Останавливаем отслеживание темы ОС
+        self.theme_manager.stop()
 
         # Останавливаем менеджер загрузок
-        if hasattr(self.download_manager, 'stop_all'):
-            self.download_manager.stop_all()
+        if self._download_manager is not None:
+            self._download_manager.stop_all()
 
         # Принимаем событие закрытия
         event.accept()
@@ -262,34 +306,34 @@ class MainWindow(QWidget):
 
     # Модифицируем методы открытия окон
     def open_qr_window(self):
-        self._create_window('qr', QRCodeWindow, self.theme_manager, self.translations)
+        self._create_window('qr', None, self.theme_manager, self.translations)
 
     def open_speedtest(self):
-        self._create_window('speedtest', SpeedTestWindow, self.theme_manager, self.translations)
+        self._create_window('speedtest', None, self.theme_manager, self.translations)
 
     def open_paint(self):
-        self._create_window('paint', PaintWindow, self.theme_manager, self.translations)
+        self._create_window('paint', None, self.theme_manager, self.translations)
 
     def open_pc_info(self):
-        self._create_window('pcinfo', PCInfoWindow, self.theme_manager, self.translations)
+        self._create_window('pcinfo', None, self.theme_manager, self.translations)
 
     def open_browser(self):
-        self._create_window('browser', Browser, self.theme_manager, self.translations)
+        self._create_window('browser', None, self.theme_manager, self.translations)
 
     def open_screenshot(self):
-        self._create_window('screenshot', ScreenshotWindow, self.theme_manager, self.translations)
+        self._create_window('screenshot', None, self.theme_manager, self.translations)
 
     def open_recorder(self):
-        self._create_window('recorder', ScreenRecorderWindow, self.theme_manager, self.translations)
+        self._create_window('recorder', None, self.theme_manager, self.translations)
 
     def open_screenshare(self):
-        self._create_window('screenshare', ScreenShareWindow, self.theme_manager, self.translations)
+        self._create_window('screenshare', None, self.theme_manager, self.translations)
 
     def open_translator(self):
-        self._create_window('translator', TranslatorWindow, self.theme_manager, self.translations)
+        self._create_window('translator', None, self.theme_manager, self.translations)
 
     def open_chat_window(self):
-        self._create_window('chat', AIChatWindow,
+        self._create_window('chat',
             translations=self.translations,
             theme_manager=self.theme_manager,
             download_manager=self.download_manager,
@@ -298,9 +342,9 @@ class MainWindow(QWidget):
         )
 
     def open_mic_window(self): 
-        self._create_window("audio_record", AudioRecorder, self.theme_manager, self.translations)
+        self._create_window("audio_record", None, self.theme_manager, self.translations)
     def open_audio_window(self): 
-        self._create_window("mixer_value_audio", VolumeMixer, self.theme_manager, self.translations)
+        self._create_window("mixer_value_audio", None, self.theme_manager, self.translations)
 
     def create_simple_window(self, title_key, label_key):
         window_id = f"simple_{title_key}"
@@ -316,8 +360,12 @@ class MainWindow(QWidget):
 
 if __name__ == "__main__":
     os.environ["QTWEBENGINE_DISABLE_GPU"] = "1"
+    # QtWebEngine импортируется лениво, после создания QApplication - это требует общего OpenGL-контекста
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     root_path = os.path.abspath(os.curdir)
     app = QApplication(sys.argv)
+    # ELIXIR_PERF=1: детектор зависаний GUI и отчет perf_report.json при выходе
+    perf.install(app)
     window = MainWindow("ru", theme_manager, root_path)
     window.show()
     sys.exit(app.exec())
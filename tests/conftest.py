@@ -0,0 +1,249 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Тесты запускаются без дисплея; замеры perf включены до импорта компонентов,
+# иначе декораторы perf.timed не оборачивают функции и спаны нельзя проверить
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["ELIXIR_PERF"] = "1"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Файловый сервер с поддержкой Range; поведение задается атрибутами сервера:
+    mode - "ranges" (по умолчанию), "no_ranges" (всегда 200), "reject_ranges" (416 на любой Range),
+    "stall" (сегменты отвечают 206 и закрываются без данных), "drop_ranges" (первый запрос - 206,
+    сегменты - 200 с файлом целиком); delay - пауза на каждые 64 КБ"""
+    protocol_version = "HTTP/1.1"
+    PIECE = 64 * 1024
+
+    def do_GET(self):
+        server = self.server
+        data = server.data
+        range_header = self.headers.get("Range")
+        server.requests.append(range_header)
+
+        if range_header and server.mode == "reject_ranges":
+            self._headers(416, 0, {"Content-Range": f"bytes */{len(data)}"})
+            return
+        match = re.match(r"bytes=(\d+)-(\d*)", range_header or "")
+        if match is None or server.mode == "no_ranges" or (server.mode == "drop_ranges" and match.group(2)):
+            self._headers(200, len(data))
+            self._body(data)
+            return
+
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(data) - 1
+        end = min(end, len(data) - 1)
+        if start >= len(data):
+            self._headers(416, 0, {"Content-Range": f"bytes */{len(data)}"})
+            return
+        extra = {"Content-Range": f"bytes {start}-{end}/{len(data)}", "ETag": '"v1"'}
+        if server.mode == "stall" and match.group(2):
+            # Ответ без длины, закрытый сразу: для клиента это "успешный" пустой ответ
+            self.send_response(206)
+            for name, value in extra.items():
+                self.send_header(name, value)
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            return
+        self._headers(206, end - start + 1, extra)
+        self._body(data[start:end + 1])
+
+    def _headers(self, status, length, extra=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _body(self, body):
+        try:
+            for offset in range(0, len(body), self.PIECE):
+                if self.server.delay:
+                    time.sleep(self.server.delay)
+                self.wfile.write(body[offset:offset + self.PIECE])
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def range_server():
+    """Локальный HTTP-сервер с поддержкой Range; файл - server.data, адрес - server.url(name)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    server.daemon_threads = True
+    server.data = os.urandom(1024 * 1024)
+    server.mode = "ranges"
+    server.delay = 0
+    server.requests = []
+    server.url = lambda name="file.bin": f"http://127.0.0.1:{server.server_port}/{name}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Заменитель API: отвечает по очереди статусами из server.statuses, затем 200"""
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными пакетами: без TCP_NODELAY keep-alive упирается в delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with server.lock:
+            server.hits += 1
+            server.connections.add(self.client_address)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            status, retry_after = server.statuses.pop(0) if server.statuses else (200, None)
+        try:
+            if server.delay:
+                time.sleep(server.delay)
+            body = json.dumps({"choices": [{"message": {"content": f"reply {server.hits}"}}]}).encode()
+            self.send_response(status)
+            if retry_after is not None:
+                self.send_header("Retry-After", retry_after)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server():
+    """Локальный заменитель chat/completions; server.statuses - очередь (статус, Retry-After),
+    server.max_active - наибольшее число одновременно обрабатываемых запросов"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ApiHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = 0
+    server.active = 0
+    server.max_active = 0
+    server.delay = 0
+    server.statuses = []
+    server.connections = set()
+    server.url = f"http://127.0.0.1:{server.server_port}/api/v1/chat/completions"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FakeVolume:
+    def __init__(self, level=1.0, muted=False):
+        self.level = level
+        self.muted = muted
+
+    def GetMasterVolume(self):
+        return self.level
+
+    def SetMasterVolume(self, level, context):
+        self.level = level
+
+    def GetMute(self):
+        return int(self.muted)
+
+    def SetMute(self, muted, context):
+        self.muted = bool(muted)
+
+
+@pytest.fixture
+def session_backend():
+    """Источник аудиосессий без Windows: backend.sessions - {session_id: (name, FakeVolume)},
+    backend.calls - число вызовов list_sessions"""
+    from vendor.components.audio_sessions import AudioSessionBackend
+
+    class FakeSessionBackend(AudioSessionBackend):
+        def __init__(self):
+            self.sessions = {}
+            self.calls = 0
+
+        def add(self, session_id, name, level=1.0, muted=False):
+            self.sessions[session_id] = (name, FakeVolume(level, muted))
+
+        def list_sessions(self):
+            self.calls += 1
+            return {
+                session_id: {
+                    "name": name, "volume": volume,
+                    "level": volume.GetMasterVolume(), "muted": bool(volume.GetMute())
+                }
+                for session_id, (name, volume) in self.sessions.items()
+            }
+
+    return FakeSessionBackend()
+
+
+@pytest.fixture
+def theme_manager(qapp):
+    from thememanager import ThemeManager
+    manager = ThemeManager()
+    yield manager
+    manager.stop()
+
+
+@pytest.fixture
+def translation_backend():
+    """Переводчик без сети: "перевод" - текст в верхнем регистре с префиксом языка.
+    backend.delay - пауза на каждую часть, backend.calls/detects - вызовы, backend.cancelled - отмененные части"""
+    import asyncio
+    from vendor.components.translation_engine import TranslationBackend
+
+    class FakeTranslationBackend(TranslationBackend):
+        def __init__(self):
+            self.delay = 0
+            self.calls = []
+            self.detects = 0
+            self.cancelled = 0
+            self.active = 0
+            self.max_active = 0
+
+        async def detect(self, text):
+            self.detects += 1
+            return "ru" if any("а" <= char <= "я" for char in text.lower()) else "en"
+
+        async def translate(self, text, dest, src="auto"):
+            self.calls.append(text)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            try:
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            finally:
+                self.active -= 1
+            return f"{dest}:{text.upper()}"
+
+    return FakeTranslationBackend()
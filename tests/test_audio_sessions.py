@@ -0,0 +1,198 @@
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from vendor.components import audio_sessions
+from vendor.components.audio_sessions import PycawBackend, SessionTracker
+
+
+@pytest.fixture
+def tracker(qapp, session_backend):
+    tracker = SessionTracker(session_backend)
+    events = []
+    tracker.sessionAdded.connect(lambda session_id, data: events.append(("added", session_id)))
+    tracker.sessionUpdated.connect(lambda session_id, data: events.append(("updated", session_id)))
+    tracker.sessionRemoved.connect(lambda session_id: events.append(("removed", session_id)))
+    tracker.events = events
+    yield tracker
+    tracker.stop()
+
+
+def test_rescan_reports_only_changes(tracker, session_backend):
+    session_backend.add("proc_1", "player.exe", 0.5)
+    session_backend.add("proc_2", "browser.exe", 1.0)
+    tracker.rescan()
+    assert sorted(tracker.events) == [("added", "proc_1"), ("added", "proc_2")]
+
+    tracker.events.clear()
+    tracker.rescan()
+    assert tracker.events == []
+
+    session_backend.sessions["proc_1"][1].level = 0.7
+    session_backend.sessions["proc_2"][1].muted = True
+    del session_backend.sessions["proc_2"]
+    session_backend.add("proc_3", "game.exe")
+    tracker.rescan()
+    assert sorted(tracker.events) == [("added", "proc_3"), ("removed", "proc_2"), ("updated", "proc_1")]
+
+
+def test_level_changes_below_one_percent_are_ignored(tracker, session_backend):
+    session_backend.add("proc_1", "player.exe", 0.5)
+    tracker.rescan()
+    tracker.events.clear()
+
+    session_backend.sessions["proc_1"][1].level = 0.501
+    tracker.rescan()
+    assert tracker.events == []
+
+
+def test_remember_suppresses_own_changes(tracker, session_backend):
+    session_backend.add("proc_1", "player.exe", 0.5)
+    tracker.rescan()
+    tracker.events.clear()
+
+    # Микшер сам поменял громкость и звук: при следующем опросе это не внешнее изменение
+    volume = session_backend.sessions["proc_1"][1]
+    volume.SetMasterVolume(0.8, None)
+    volume.SetMute(1, None)
+    tracker.remember("proc_1", level=0.8)
+    tracker.remember("proc_1", muted=True)
+    tracker.remember("proc_unknown", level=0.1)
+    tracker.rescan()
+    assert tracker.events == []
+
+
+def test_poll_interval_backs_off_and_resets(tracker, session_backend):
+    session_backend.add("proc_1", "player.exe")
+    tracker.rescan()
+    assert tracker._timer.interval() == SessionTracker.MIN_INTERVAL
+
+    intervals = []
+    for _ in range(6):
+        tracker.rescan()
+        intervals.append(tracker._timer.interval())
+    assert intervals == [1000, 2000, 4000, 8000, 8000, 8000]
+
+    session_backend.sessions["proc_1"][1].level = 0.3
+    tracker.rescan()
+    assert tracker._timer.interval() == SessionTracker.MIN_INTERVAL
+
+    tracker.rescan()
+    tracker.poke()
+    assert tracker._timer.interval() == SessionTracker.EVENT_DELAY
+    assert tracker._interval == SessionTracker.MIN_INTERVAL
+
+
+def test_backend_errors_keep_snapshot(tracker, session_backend, monkeypatch):
+    session_backend.add("proc_1", "player.exe")
+    tracker.rescan()
+    tracker.events.clear()
+
+    def fail():
+        raise OSError("COM недоступен")
+
+    monkeypatch.setattr(session_backend, "list_sessions", fail)
+    tracker.rescan()
+    assert tracker.events == []
+    assert "proc_1" in tracker._snapshot
+
+
+class FakeSession:
+    def __init__(self, pid, level=1.0, state=1):
+        self.ProcessId = pid
+        self.State = state
+        self.volume = SimpleNamespace(GetMasterVolume=lambda: level, GetMute=lambda: 0)
+        self._ctl = SimpleNamespace(QueryInterface=self._query)
+        self.queries = 0
+        self.callback = None
+        self.unregistered = 0
+
+    def _query(self, interface):
+        self.queries += 1
+        return self.volume
+
+    def register_notification(self, callback):
+        self.callback = callback
+
+    def unregister_notification(self):
+        self.unregistered += 1
+
+
+@pytest.fixture
+def pycaw(monkeypatch):
+    """Заменитель pycaw: сессии - pycaw.sessions, менеджер уведомлений - pycaw.manager"""
+    state = SimpleNamespace(sessions=[], names={}, name_calls=0)
+    state.manager = SimpleNamespace(
+        registered=None,
+        RegisterSessionNotification=lambda notification: setattr(state.manager, "registered", notification),
+        UnregisterSessionNotification=lambda notification: setattr(state.manager, "registered", None)
+    )
+    utilities = SimpleNamespace(
+        GetAllSessions=lambda: list(state.sessions),
+        GetAudioSessionManager=lambda: state.manager
+    )
+    package = ModuleType("pycaw")
+    module = ModuleType("pycaw.pycaw")
+    module.AudioUtilities = utilities
+    module.ISimpleAudioVolume = object()
+    callbacks = ModuleType("pycaw.callbacks")
+    callbacks.AudioSessionNotification = type("AudioSessionNotification", (), {})
+    callbacks.AudioSessionEvents = type("AudioSessionEvents", (), {})
+    monkeypatch.setitem(sys.modules, "pycaw", package)
+    monkeypatch.setitem(sys.modules, "pycaw.pycaw", module)
+    monkeypatch.setitem(sys.modules, "pycaw.callbacks", callbacks)
+
+    def process(pid):
+        state.name_calls += 1
+        return SimpleNamespace(name=lambda: state.names[pid])
+
+    monkeypatch.setattr(audio_sessions.psutil, "Process", process)
+    return state
+
+
+def test_process_names_and_volumes_are_cached(pycaw):
+    pycaw.names = {10: "player.exe", 20: "browser.exe"}
+    first, second = FakeSession(10), FakeSession(20)
+    pycaw.sessions = [FakeSession(0), first, second, FakeSession(30, state=PycawBackend.EXPIRED_STATE)]
+    backend = PycawBackend()
+
+    for _ in range(3):
+        sessions = backend.list_sessions()
+    assert set(sessions) == {"system_sounds", "proc_10", "proc_20"}
+    assert sessions["proc_10"]["name"] == "player.exe"
+    assert pycaw.name_calls == 2
+    assert first.queries == 1
+
+    # Исчезнувший процесс забывается: его PID может получить другая программа
+    pycaw.sessions.remove(second)
+    pycaw.names[20] = "editor.exe"
+    backend.list_sessions()
+    pycaw.sessions.append(FakeSession(20))
+    assert backend.list_sessions()["proc_20"]["name"] == "editor.exe"
+
+
+def test_session_callbacks_unregistered(pycaw):
+    pycaw.names = {10: "player.exe", 20: "browser.exe"}
+    first, second = FakeSession(10), FakeSession(20)
+    pycaw.sessions = [first, second]
+    changes = []
+    backend = PycawBackend()
+    assert backend.subscribe(lambda: changes.append(1))
+    assert pycaw.manager.registered is not None
+
+    backend.list_sessions()
+    assert first.callback is not None and second.callback is not None
+    second.callback.on_state_changed(2, "Expired")
+    assert changes == [1]
+
+    pycaw.sessions.remove(second)
+    backend.list_sessions()
+    assert second.unregistered == 1
+    assert "proc_20" not in backend._session_callbacks
+
+    backend.unsubscribe()
+    assert first.unregistered == 1
+    assert second.unregistered == 1
+    assert backend._session_callbacks == {}
+    assert pycaw.manager.registered is None
@@ -0,0 +1,86 @@
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+
+from vendor.components.audio_writer import WavStreamWriter
+
+RATE = 16000
+CHUNK = 1024
+
+
+def _buffer(index):
+    # Синусоида с меняющейся частотой: каждый буфер отличается от соседних
+    t = (np.arange(CHUNK) + index * CHUNK) / RATE
+    return (np.sin(2 * np.pi * (200 + index % 50) * t) * 16000).astype(np.int16).tobytes()
+
+
+def _push_paced(writer, data):
+    # Микрофон отдает буферы в реальном темпе; тест не должен обгонять писателя до переполнения
+    while writer.buffers.qsize() > 16:
+        time.sleep(0.0005)
+    writer.push(data)
+
+
+def test_long_recording_keeps_memory_flat(tmp_path):
+    path = str(tmp_path / "recording.wav.part")
+    writer = WavStreamWriter(path, 1, 2, RATE)
+    writer.start()
+    total = 3000     # ~3 минуты звука при 16 кГц
+
+    tracemalloc.start()
+    try:
+        for i in range(200):
+            _push_paced(writer, _buffer(i))
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for i in range(200, total):
+            _push_paced(writer, _buffer(i))
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    writer.stop()
+    writer.join(timeout=5)
+
+    assert not writer.is_alive()
+    assert writer.error is None
+    assert writer.dropped == 0
+    # Рост памяти не зависит от длительности: в очереди не больше нескольких буферов
+    assert current - baseline < 256 * 1024
+    assert peak - baseline < 256 * 1024
+
+    assert writer.frames_written == total * CHUNK
+    with wave.open(path, "rb") as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getsampwidth() == 2
+        assert wav.getframerate() == RATE
+        assert wav.getnframes() == total * CHUNK
+        wav.setpos((total - 1) * CHUNK)
+        assert wav.readframes(CHUNK) == _buffer(total - 1)
+
+
+def test_push_drops_buffers_when_queue_is_full(tmp_path):
+    writer = WavStreamWriter(str(tmp_path / "recording.wav.part"), 1, 2, RATE, max_buffers=8)
+    for i in range(12):
+        writer.push(_buffer(i))
+    assert writer.dropped == 4
+
+    writer.start()
+    writer.stop()
+    writer.join(timeout=5)
+    # Уже принятые буферы дописываются после stop
+    assert writer.frames_written == 8 * CHUNK
+
+
+def test_stop_wakes_idle_writer(tmp_path):
+    writer = WavStreamWriter(str(tmp_path / "recording.wav.part"), 1, 2, RATE)
+    writer.start()
+    writer.push(_buffer(0))
+    time.sleep(0.05)
+    started = time.perf_counter()
+    writer.stop()
+    writer.join(timeout=5)
+
+    assert time.perf_counter() - started < 2 * WavStreamWriter.WAIT_TIMEOUT + 0.1
+    assert writer.level[1] > 0.4     # пик синусоиды 16000 / 32768
@@ -0,0 +1,395 @@
+"""Бенчмарки горячих путей: python -m pytest tests/test_benchmarks.py --benchmark-only
+Кроме времени, проверяются спаны и счетчики perf: число вызовов, промахи кэшей, объем данных"""
+import itertools
+import os
+import time
+
+import numpy as np
+import pytest
+import requests
+
+pytest.importorskip("pytest_benchmark")
+
+from vendor.components import perf
+from vendor.components.ai_model_manager import ModelClient
+from vendor.components.audio_sessions import SessionTracker
+from vendor.components.chat_history import ChatHistory
+from vendor.components.command_manager import CommandManager
+from vendor.components.manager_download import Download_Manager
+from vendor.components.screen_capture import FrameRing
+from vendor.components.screesharewindow import MjpegBroadcaster
+from vendor.components.translation_engine import TranslationEngine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PALETTE = {
+    "bg": "#1e1e1e", "fg": "#ffffff", "hover": "#333333", "fg_message": "#000000",
+    "bg_error": "#f8d7da", "bg_warning": "#fff3cd", "bg_info": "#d1ecf1"
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_perf():
+    perf.reset()
+    yield
+
+
+def span(name):
+    return perf.snapshot()["spans"].get(name, {"count": 0})
+
+
+def counter(name):
+    return perf.snapshot()["counters"].get(name, 0)
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = ChatHistory(str(tmp_path))
+    yield history
+    history.close()
+
+
+def test_history_append(benchmark, history):
+    benchmark(history.add_message, "Сообщение средней длины " * 4, "user")
+    assert span("history.append")["count"] == history.count_messages()
+
+
+def test_history_load_page(benchmark, history):
+    for i in range(5000):
+        history.add_message(f"message {i}", "user" if i % 2 else "bot")
+    perf.reset()
+
+    page = benchmark(history.get_messages, limit=50)
+    assert len(page) == 50
+    assert span("history.load")["count"] >= 1
+
+
+@pytest.fixture
+def message_view(qapp, monkeypatch):
+    from vendor.components.message_list import MessageListModel, MessageDelegate, MessageListView
+
+    # Иконки отправителей ищутся по относительным путям
+    monkeypatch.chdir(ROOT)
+    model = MessageListModel()
+    for i in range(1000):
+        text = f"**Сообщение {i}**\n\n" + "Текст с `кодом` и [ссылкой](https://example.com). " * (1 + i % 8)
+        model.append_message(text, "user" if i % 2 else "bot", "" if i % 7 else "info")
+    view = MessageListView()
+    view.setModel(model)
+    view.setItemDelegate(MessageDelegate(PALETTE, view))
+    view.resize(800, 600)
+    view.show()
+    # Первая раскладка идет без полосы прокрутки; после ее появления ширина строк меняется
+    view.doItemsLayout()
+    qapp.processEvents()
+    yield view
+    view.close()
+
+
+def test_message_rendering(benchmark, qapp, message_view):
+    message_view.scrollToBottom()
+    message_view.viewport().grab()
+    visible_misses = counter("chat.layout_cache_miss")
+    heights = counter("chat.height_cache_miss")
+
+    benchmark(lambda: message_view.viewport().grab())
+
+    # Повторная отрисовка берет документы из кэша, а высоты строк не пересчитываются
+    assert counter("chat.layout_cache_miss") == visible_misses
+    assert counter("chat.height_cache_miss") == heights
+    assert visible_misses < 50
+    assert span("chat.paint_message")["count"] > 0
+
+
+def test_message_relayout_uses_cached_heights(benchmark, qapp, message_view):
+    heights = counter("chat.height_cache_miss")
+    assert heights >= message_view.model().rowCount()
+
+    benchmark(lambda: message_view.doItemsLayout())
+    assert counter("chat.height_cache_miss") == heights
+
+
+def test_parse_arguments(benchmark):
+    manager = CommandManager()
+    text = '--url="https://example.com/models/model.bin" --type="models" --text="hello" --sender="bot"'
+
+    args = benchmark(manager.parse_arguments, text)
+    assert args == {"url": "https://example.com/models/model.bin", "type": "models", "text": "hello", "sender": "bot"}
+    assert span("commands.parse_arguments")["count"] >= 1
+
+
+def _synthetic_frame(width, height):
+    rng = np.random.default_rng(0)
+    # Плавный градиент с шумом - ближе к экрану, чем чистый шум
+    gradient = np.linspace(0, 255, width, dtype=np.uint8)[None, :, None]
+    frame = np.broadcast_to(gradient, (height, width, 4)).copy()
+    frame[::8, ::8, :3] = rng.integers(0, 255, (len(range(0, height, 8)), len(range(0, width, 8)), 3))
+    return frame
+
+
+def test_frame_encode(benchmark):
+    broadcaster = MjpegBroadcaster(quality=80)
+    shot = _synthetic_frame(1920, 1080)
+
+    jpeg = benchmark(broadcaster._encode, shot)
+    assert jpeg[:2] == b"\xff\xd8"
+    assert span("screenshare.encode")["count"] >= 1
+
+
+def test_frame_ring_capture_cycle(benchmark):
+    width, height = 1280, 720
+    ring = FrameRing(8, width, height)
+    source = _synthetic_frame(width, height)[:, :, :3]
+    out = np.empty((height, width, 3), dtype=np.uint8)
+
+    def cycle():
+        _, frame = ring.reserve()
+        np.copyto(frame, source)
+        ring.commit(0.0)
+        return ring.pop(out, timeout=1)
+
+    assert benchmark(cycle) == 0.0
+    assert ring.dropped == 0
+    assert np.array_equal(out, source)
+
+
+def test_download_throughput(benchmark, range_server, tmp_path):
+    range_server.data = np.random.default_rng(0).bytes(8 * 1024 * 1024)
+    manager = Download_Manager(base_directory=str(tmp_path))
+    manager.MIN_SEGMENT_SIZE = 1024 * 1024
+
+    try:
+        result = benchmark.pedantic(
+            manager.download_file, args=(range_server.url(), "models"), rounds=3, iterations=1
+        )
+    finally:
+        manager.stop_all()
+
+    assert result[2] == "info"
+    assert span("download.file")["count"] == 3
+    assert counter("download.bytes") == 3 * len(range_server.data)
+
+
+def test_model_post_plain_requests(benchmark, api_server):
+    # Базовая линия: новое TCP-соединение на каждый запрос
+    response = benchmark(requests.post, api_server.url, json={"model": "m"}, timeout=5)
+    assert response.status_code == 200
+    assert len(api_server.connections) == api_server.hits
+
+
+def test_model_post_client(benchmark, api_server):
+    client = ModelClient(max_concurrent=4, backoff=0)
+
+    def post():
+        with client.post(api_server.url, json={"model": "m"}, timeout=5) as response:
+            return response.json()
+
+    try:
+        assert benchmark(post)["choices"]
+    finally:
+        client.close()
+    # Все запросы идут по одному keep-alive соединению
+    assert len(api_server.connections) == 1
+
+
+@pytest.mark.parametrize("count", [100, 500])
+def test_session_rescan(benchmark, qapp, session_backend, count):
+    for i in range(count):
+        session_backend.add(f"proc_{i}", f"app_{i}.exe", (i % 100) / 100)
+    tracker = SessionTracker(session_backend)
+    updates = []
+    tracker.sessionUpdated.connect(lambda session_id, data: updates.append(session_id))
+    tracker.rescan()
+
+    def rescan():
+        # Между опросами меняется одна сессия: сигнал должен уйти только по ней
+        volume = session_backend.sessions["proc_0"][1]
+        volume.level = 0.5 if volume.level != 0.5 else 0.25
+        tracker.rescan()
+
+    try:
+        benchmark(rescan)
+    finally:
+        tracker.stop()
+    assert set(updates) == {"proc_0"}
+    assert len(updates) == session_backend.calls - 1
+
+
+def _long_text():
+    return "\n".join(f"Абзац {i}: " + "слово " * 120 for i in range(100))
+
+
+def test_translation_split_chunks(benchmark):
+    text = _long_text()
+    chunks = benchmark(TranslationEngine.split_chunks, text)
+    assert len(chunks) > 1
+    assert TranslationEngine._join(chunks, [chunk for chunk, _ in chunks]) == text
+
+
+def test_translation_cached_text(benchmark, qapp, translation_backend, tmp_path):
+    # Повторный перевод длинного текста, все части которого уже в кэше
+    engine = TranslationEngine(translation_backend, cache_file=str(tmp_path / "cache.json"))
+    results = []
+    engine.translated.connect(lambda request_id, text, lang: results.append(text))
+    text = _long_text()
+    try:
+        engine.translate(text, "de")
+        deadline = time.monotonic() + 5
+        while not results and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.005)
+        calls = len(translation_backend.calls)
+
+        benchmark(engine.translate, text, "de")
+    finally:
+        engine.shutdown()
+    assert len(translation_backend.calls) == calls
+    assert len(set(results)) == 1
+
+
+def _window_stylesheet(palette):
+    return f"""
+        QWidget {{ background-color: {palette['bg']}; color: {palette['fg']}; font-family: 'Segoe UI'; }}
+        QPushButton {{ background: {palette['bg']}; border: 1px solid {palette['border']}; border-radius: 10px; }}
+        QPushButton:hover {{ background-color: {palette['hover']}; }}
+        QPushButton:pressed {{ background-color: {palette['pressed']}; }}
+        QLabel {{ border: 1px solid {palette['border']}; padding: 10px; }}
+    """
+
+
+@pytest.fixture
+def themed_window(qapp):
+    from PyQt6.QtWidgets import QLabel, QPushButton, QVBoxLayout, QWidget
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    for i in range(40):
+        layout.addWidget(QPushButton(f"button {i}") if i % 2 else QLabel(f"label {i}"))
+    window.show()
+    qapp.processEvents()
+    yield window
+    window.deleteLater()
+
+
+@pytest.mark.parametrize("cache", ["cold", "warm", "same_theme"])
+def test_theme_switch(benchmark, qapp, theme_manager, themed_window, cache):
+    builds = []
+
+    def builder(palette):
+        builds.append(palette["bg"])
+        return _window_stylesheet(palette)
+
+    themes = itertools.cycle(["dark"] if cache == "same_theme" else ["light", "dark"])
+
+    def switch():
+        if cache == "cold":
+            theme_manager._stylesheets.clear()
+        theme_manager.apply_stylesheet(themed_window, "Window", builder, next(themes))
+        qapp.processEvents()
+
+    switch()
+    switch()
+    builds.clear()
+    benchmark(switch)
+    if cache == "cold":
+        assert builds
+    else:
+        # Прогретый кэш: QSS не собирается заново; та же тема не трогает стиль окна
+        assert builds == []
+
+
+def _recorded_stroke(width, height, events=1200):
+    # Запись штриха: 1200 событий мыши (~2.4 с при 500 Гц) - волна через весь холст
+    return [
+        (40 + (width - 80) * i / events, height / 2 + height / 3 * np.sin(i / events * 6 * np.pi))
+        for i in range(events)
+    ]
+
+
+def _mouse(kind, point, buttons):
+    from PyQt6.QtCore import QEvent, QPointF, Qt
+    from PyQt6.QtGui import QMouseEvent
+    button = Qt.MouseButton.NoButton if kind == QEvent.Type.MouseMove else Qt.MouseButton.LeftButton
+    return QMouseEvent(kind, QPointF(*point), QPointF(*point), button, buttons, Qt.KeyboardModifier.NoModifier)
+
+
+def _image_bytes(image):
+    return bytes(image.constBits().asarray(image.sizeInBytes()))
+
+
+def test_paint_stroke_replay_4k(benchmark, qapp, theme_manager):
+    from PyQt6.QtCore import QEvent, Qt
+    from PyQt6.QtGui import QColor, QPainter, QLinearGradient
+    from vendor.components.paintwindow import PaintWidget
+
+    widget = PaintWidget(theme_manager)
+    widget.resize_canvas(3840, 2160)
+    # Неоднородный фон: отмена должна вернуть именно исходные пиксели, а не пустой тайл
+    gradient = QLinearGradient(0, 0, 3840, 2160)
+    gradient.setColorAt(0, QColor("#204080"))
+    gradient.setColorAt(1, QColor("#f0c020"))
+    painter = QPainter(widget.image)
+    painter.fillRect(widget.image.rect(), gradient)
+    painter.end()
+    widget.set_brush_size(12)
+    widget.set_brush_color(QColor("#e03030"))
+    widget.show()
+    qapp.processEvents()
+
+    stroke = _recorded_stroke(3840, 2160)
+    events_per_frame = 8    # 500 Гц мыши при кадре 16 мс
+    original = _image_bytes(widget.image)
+    held = Qt.MouseButton.LeftButton
+
+    def replay():
+        widget.mousePressEvent(_mouse(QEvent.Type.MouseButtonPress, stroke[0], held))
+        for i, point in enumerate(stroke[1:], 1):
+            widget.mouseMoveEvent(_mouse(QEvent.Type.MouseMove, point, held))
+            if i % events_per_frame == 0:
+                # Кадр: таймер штриха и отрисовка измененной области
+                widget._flush_stroke()
+                qapp.processEvents()
+        widget.mouseReleaseEvent(_mouse(QEvent.Type.MouseButtonRelease, stroke[-1], Qt.MouseButton.NoButton))
+        qapp.processEvents()
+
+    def reset():
+        widget.history.clear()
+        widget.image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(widget.image)
+        painter.fillRect(widget.image.rect(), gradient)
+        painter.end()
+        widget._invalidate_tiles()
+        qapp.processEvents()
+        perf.reset()
+
+    try:
+        benchmark.pedantic(replay, setup=reset, rounds=5, iterations=1)
+
+        flush = span("paint.flush_stroke")
+        paint = span("paint.paintEvent")
+        benchmark.extra_info.update({
+            "flush_avg_ms": round(flush["avg_ms"], 3), "flush_max_ms": round(flush["max_ms"], 3),
+            "frame_avg_ms": round(paint["avg_ms"], 3), "frame_max_ms": round(paint["max_ms"], 3),
+            "frames": paint["count"]
+        })
+        assert flush["count"] >= len(stroke) // events_per_frame
+        assert paint["count"] > 0
+
+        # В истории только тайлы, которых коснулся штрих, а не весь холст
+        entry = widget.history._undo[-1]
+        tile_bytes = PaintWidget.TILE_SIZE * PaintWidget.TILE_SIZE * 4
+        total_tiles = len(widget._tiles_in(widget.image.rect()))
+        assert len(widget.history._undo) == 1
+        assert widget.history._memory == sum(image.sizeInBytes() for image in entry.values())
+        assert widget.history._memory <= len(entry) * tile_bytes
+        assert len(entry) < total_tiles * 0.75
+
+        # Отмена возвращает исходные пиксели, повтор - нарисованный штрих
+        drawn = _image_bytes(widget.image)
+        assert drawn != original
+        widget.undo()
+        assert _image_bytes(widget.image) == original
+        widget.redo()
+        assert _image_bytes(widget.image) == drawn
+        widget.undo()
+        assert _image_bytes(widget.image) == original
+    finally:
+        widget.deleteLater()
@@ -0,0 +1,114 @@
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+
+from vendor.components.chat_history import ChatHistory
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = ChatHistory(str(tmp_path))
+    yield history
+    history.close()
+
+
+def _fill(history, count):
+    """Быстро дописывает count записей напрямую в базу, минуя add_message"""
+    now = datetime.now().isoformat()
+    rows = []
+    for i in range(count):
+        entry = {"id": str(uuid.uuid4()), "text": f"message {i}", "sender": "user", "type": "info", "timestamp": now}
+        rows.append((entry["id"], now, json.dumps(entry)))
+    with history._lock, history._connection:
+        history._connection.executemany("INSERT INTO messages (id, timestamp, data) VALUES (?, ?, ?)", rows)
+
+
+def _median_append(history, samples=200):
+    timings = []
+    for i in range(samples):
+        started = time.perf_counter()
+        history.add_message(f"sample {i}", "user")
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def test_add_and_read_back(history):
+    history.add_message("привет", "user")
+    history.add_command("/help")
+    messages = history.get_messages()
+    assert [item.get("text", item.get("command")) for item in messages] == ["привет", "/help"]
+    assert history.count_messages() == 2
+
+
+def test_keyset_pages_cover_history_in_order(history):
+    for i in range(25):
+        history.add_message(f"m{i}", "user")
+    page = history.get_messages(limit=10)
+    assert [item["text"] for item in page] == [f"m{i}" for i in range(15, 25)]
+
+    seen = page
+    while len(page) == 10:
+        page = history.get_messages(seen[0]["seq"], 10)
+        seen = page + seen
+    assert [item["text"] for item in seen] == [f"m{i}" for i in range(25)]
+
+
+def test_migrates_legacy_json(tmp_path):
+    data_directory = tmp_path / "vendor" / "data"
+    data_directory.mkdir(parents=True)
+    legacy = {"created_at": "2024-01-01T00:00:00", "messages": [
+        {"id": "1", "text": "old", "sender": "user", "type": "info", "timestamp": "2024-01-01T00:00:01"}
+    ]}
+    (data_directory / "chat_history.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    history = ChatHistory(str(tmp_path))
+    try:
+        assert [item["text"] for item in history.get_messages()] == ["old"]
+        assert (data_directory / "chat_history.json.migrated").exists()
+    finally:
+        history.close()
+
+
+def test_clear_history(history):
+    history.add_message("a", "user")
+    history.clear_history()
+    assert history.count_messages() == 0
+
+
+def test_closed_history_ignores_calls(history):
+    history.add_message("a", "user")
+    history.close()
+    history.add_message("b", "user")
+    history.clear_history()
+    assert history.get_messages() == []
+    assert history.count_messages() == 0
+    history.close()
+
+
+def test_append_latency_stays_flat(history):
+    """Добавление не зависит от объема истории: от 100 до 100 000 записей"""
+    _fill(history, 100)
+    small = _median_append(history)
+    _fill(history, 100_000)
+    large = _median_append(history)
+    # Запас на шум диска и планировщика; переписывание всего файла дало бы рост на порядки
+    assert large < small * 5 + 0.001
+
+
+def test_latest_page_load_is_independent_of_history_size(history):
+    _fill(history, 100_000)
+    started = time.perf_counter()
+    page = history.get_messages(limit=50)
+    elapsed = time.perf_counter() - started
+    assert len(page) == 50
+    assert page[-1]["text"] == "message 99999"
+    assert elapsed < 0.1
+
+    started = time.perf_counter()
+    older = history.get_messages(page[0]["seq"], 50)
+    assert time.perf_counter() - started < 0.1
+    assert older[-1]["seq"] == page[0]["seq"] - 1
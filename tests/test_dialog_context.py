@@ -0,0 +1,99 @@
+from vendor.components.ai_model_manager import DialogContext, ModelWorker
+
+
+def _text(tokens):
+    """Текст, оценка которого ровно tokens токенов"""
+    return "x" * ((tokens - 4) * 4)
+
+
+def test_estimate_tokens_counts_utf8_bytes():
+    assert DialogContext.estimate_tokens("") == 4
+    assert DialogContext.estimate_tokens("abcd") == 5
+    # Кириллица - два байта на символ
+    assert DialogContext.estimate_tokens("абвг") == 6
+
+
+def test_budget_evicts_oldest_turns():
+    context = DialogContext(token_budget=100, summarize=False)
+    for i in range(10):
+        context.add("user", f"{i}" + _text(20)[1:])
+    assert context.total_tokens <= 100
+    contents = [message["content"][0] for message in context.messages()]
+    assert contents == ["5", "6", "7", "8", "9"]
+
+
+def test_system_messages_are_pinned():
+    context = DialogContext(token_budget=60, summarize=False)
+    context.add("system", "prompt")
+    context.add("system", "Available commands: /help")
+    for _ in range(20):
+        context.add("user", _text(20))
+
+    messages = context.messages()
+    assert messages[0] == {"role": "system", "content": "prompt"}
+    assert messages[1] == {"role": "system", "content": "Available commands: /help"}
+    assert context.total_tokens <= 60
+
+
+def test_last_turn_kept_even_over_budget():
+    context = DialogContext(token_budget=10, summarize=False)
+    context.add("user", _text(5))
+    context.add("user", _text(500))
+    messages = context.messages()
+    assert len(messages) == 1
+    assert len(messages[0]["content"]) == len(_text(500))
+
+
+def test_evicted_turns_go_to_summary():
+    context = DialogContext(token_budget=120, summary_budget=200)
+    context.add("system", "prompt")
+    context.add("user", "first question " + _text(40))
+    context.add("assistant", "first answer " + _text(40))
+    context.add("user", "second question " + _text(40))
+
+    messages = context.messages()
+    assert messages[0]["content"] == "prompt"
+    summary = messages[1]
+    assert summary["role"] == "system"
+    assert summary["content"].startswith("Summary of earlier conversation:")
+    assert "user: first question" in summary["content"]
+    assert "assistant: first answer" in summary["content"]
+    assert messages[-1]["content"].startswith("second question")
+
+
+def test_summary_is_cached_and_bounded():
+    context = DialogContext(token_budget=50, summary_budget=40)
+    for i in range(30):
+        context.add("user", f"turn {i} " + _text(30))
+
+    first = context.messages()[0]
+    assert context.messages()[0] is first
+    # Сводка сама ограничена бюджетом: каждая строка больше 40 токенов, поэтому остается одна, последняя
+    summary_lines = first["content"].splitlines()[1:]
+    assert len(summary_lines) == 1
+    assert summary_lines[0].startswith("user: turn 28 ")
+    # Строки сводки обрезаются
+    line = first["content"].splitlines()[-1]
+    assert len(line) <= len("user: ") + DialogContext.SUMMARY_LINE_CHARS + 3
+
+
+def test_clear_drops_everything():
+    context = DialogContext(token_budget=50)
+    for _ in range(5):
+        context.add("user", _text(20))
+    context.clear()
+    assert context.messages() == []
+    assert context.total_tokens == 0
+
+
+def test_worker_keeps_commands_pinned_after_reset():
+    worker = ModelWorker("key", "model", client=object(), context_budget=200)
+    worker.set_commands_info("/help - помощь")
+    for _ in range(50):
+        worker.add_to_context("user", _text(30))
+    assert any("Available commands" in message["content"] for message in worker.dialogs)
+
+    worker.clear_context()
+    roles = [message["role"] for message in worker.dialogs]
+    assert roles == ["system", "system"]
+    assert "Available commands" in worker.dialogs[1]["content"]
@@ -0,0 +1,159 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from vendor.components import manager_download
+from vendor.components.manager_download import Download_Manager, DownloadInProgress
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = Download_Manager(base_directory=str(tmp_path))
+    manager.MIN_SEGMENT_SIZE = 128 * 1024
+    manager.PROGRESS_INTERVAL = 0
+    manager.STATE_INTERVAL = 0
+    yield manager
+    manager.stop_all()
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Паузы между повторами не нужны в тестах"""
+    monkeypatch.setattr(manager_download, "time", SimpleNamespace(monotonic=time.monotonic, sleep=lambda seconds: None))
+
+
+def _downloaded(tmp_path, name="file.bin"):
+    with open(os.path.join(tmp_path, "models", name), "rb") as f:
+        return f.read()
+
+
+def _segment_ranges(requests):
+    return [header for header in requests if header and not header.endswith("-")]
+
+
+def test_segmented_download(manager, range_server, tmp_path):
+    text, _, message_type = manager.download_file(range_server.url(), "models")
+
+    assert message_type == "info", text
+    assert _downloaded(tmp_path) == range_server.data
+    assert len(_segment_ranges(range_server.requests)) == 4
+    assert not os.path.exists(os.path.join(tmp_path, "models", "file.bin.part.json"))
+
+
+def test_resume_after_cancel(manager, range_server, tmp_path):
+    range_server.delay = 0.02
+
+    def cancel_halfway(job):
+        if job.downloaded > len(range_server.data) // 2:
+            job.cancel()
+
+    job = manager.submit(range_server.url(), "models", on_progress=cancel_halfway)
+    _, _, message_type = job.future.result(timeout=10)
+    assert message_type == "warning"
+    part_path = os.path.join(tmp_path, "models", "file.bin.part")
+    assert os.path.exists(part_path) and os.path.exists(part_path + ".json")
+
+    range_server.delay = 0
+    range_server.requests.clear()
+    job = manager.submit(range_server.url(), "models")
+    _, _, message_type = job.future.result(timeout=10)
+
+    assert message_type == "info"
+    assert job.resumed > 0
+    assert _downloaded(tmp_path) == range_server.data
+    # Докачиваются только недостающие части сегментов
+    segment_size = len(range_server.data) // 4
+    starts = [int(header[6:].split("-")[0]) for header in _segment_ranges(range_server.requests)]
+    assert any(start % segment_size for start in starts)
+
+
+def test_falls_back_to_single_stream_without_ranges(manager, range_server, tmp_path):
+    range_server.mode = "no_ranges"
+    _, _, message_type = manager.download_file(range_server.url(), "models")
+
+    assert message_type == "info"
+    assert _downloaded(tmp_path) == range_server.data
+    assert len(range_server.requests) == 1
+
+
+def test_falls_back_to_plain_get_on_416(manager, range_server, tmp_path):
+    range_server.mode = "reject_ranges"
+    _, _, message_type = manager.download_file(range_server.url(), "models")
+
+    assert message_type == "info"
+    assert _downloaded(tmp_path) == range_server.data
+    assert range_server.requests == ["bytes=0-", None]
+
+
+def test_empty_file(manager, range_server, tmp_path):
+    range_server.data = b""
+    _, _, message_type = manager.download_file(range_server.url(), "models")
+
+    assert message_type == "info"
+    assert _downloaded(tmp_path) == b""
+
+
+def test_segment_closed_without_data_fails(manager, range_server, no_backoff):
+    range_server.mode = "stall"
+    text, _, message_type = manager.download_file(range_server.url(), "models")
+
+    assert message_type == "error"
+    assert "не передавая данных" in text
+    # Каждый сегмент: первая попытка и MAX_STALLS повторов
+    assert len(_segment_ranges(range_server.requests)) <= 4 * (manager.MAX_STALLS + 1)
+
+
+def test_submit_reports_progress_and_result(manager, range_server):
+    progress = []
+    results = []
+    job = manager.submit(
+        range_server.url(), "models",
+        on_progress=lambda job: progress.append(job.downloaded),
+        on_done=lambda job, result: results.append(result)
+    )
+    job.future.result(timeout=10)
+
+    assert results and results[0][2] == "info"
+    assert progress[-1] == len(range_server.data)
+    assert progress == sorted(progress)
+
+
+def test_non_206_segment_response_closed(manager, range_server, no_backoff):
+    range_server.mode = "drop_ranges"
+    responses = []
+    get = manager.session.get
+
+    def recording_get(*args, **kwargs):
+        response = get(*args, **kwargs)
+        responses.append(response)
+        return response
+
+    manager.session.get = recording_get
+    text, _, message_type = manager.download_file(range_server.url(), "models")
+
+    assert message_type == "error"
+    assert "докачку" in text
+    assert len(responses) > 1
+    assert all(response.raw.closed for response in responses)
+
+
+def test_duplicate_target_rejected(manager, range_server, tmp_path):
+    range_server.delay = 0.02
+    job = manager.submit(range_server.url(), "models")
+
+    with pytest.raises(DownloadInProgress):
+        manager.submit(range_server.url(), "models")
+    text, _, message_type = manager.download_file(range_server.url(), "models")
+    assert message_type == "warning"
+    assert "уже загружается" in text
+    # Тот же файл в другую папку - другая цель
+    other = manager.submit(range_server.url(), "other")
+
+    assert job.future.result(timeout=30)[2] == "info"
+    assert other.future.result(timeout=30)[2] == "info"
+    assert _downloaded(tmp_path) == range_server.data
+    # Когда загрузка закончилась, файл можно качать снова
+    range_server.delay = 0
+    assert manager.submit(range_server.url(), "models").future.result(timeout=10)[2] == "info"
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from vendor.components.ai_model_manager import ModelClient, ModelWorker
+
+
+@pytest.fixture
+def client():
+    client = ModelClient(max_concurrent=3, backoff=0)
+    yield client
+    client.close()
+
+
+def _wait(qapp, condition, timeout=5):
+    # Сигналы из потоков пула доставляются в GUI-поток очередью: нужен цикл событий
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def _post(client, server):
+    with client.post(server.url, json={"model": "m"}, timeout=5) as response:
+        response.content
+        return response
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_with_retry_after(client, api_server, status):
+    api_server.statuses = [(status, "0"), (status, "0")]
+    response = _post(client, api_server)
+
+    assert response.status_code == 200
+    assert api_server.hits == 3
+    assert len(response.raw.retries.history) == 2
+
+
+@pytest.mark.parametrize("status, retry_after", [(429, None), (500, "0"), (502, None)])
+def test_no_retry_for_other_failures(client, api_server, status, retry_after):
+    # Без Retry-After и на 5xx запрос мог выполниться: повтор стоил бы второй генерации
+    api_server.statuses = [(status, retry_after)]
+    response = _post(client, api_server)
+
+    assert response.status_code == status
+    assert api_server.hits == 1
+
+
+def test_gives_up_after_retry_limit(client, api_server):
+    api_server.statuses = [(503, "0")] * 10
+    response = _post(client, api_server)
+
+    assert response.status_code == 503
+    assert api_server.hits == 4    # первая попытка и три повтора
+
+
+def test_keep_alive_connection_reused(client, api_server):
+    for _ in range(10):
+        assert _post(client, api_server).status_code == 200
+    assert api_server.hits == 10
+    assert len(api_server.connections) == 1
+
+
+def test_concurrent_posts_capped_by_semaphore(client, api_server):
+    api_server.delay = 0.1
+    threads = [threading.Thread(target=_post, args=(client, api_server)) for _ in range(9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert api_server.hits == 9
+    assert api_server.max_active == 3
+
+
+def test_submit_prompt_runs_several_requests_in_flight(qapp, client, api_server):
+    api_server.delay = 0.2
+    worker = ModelWorker("key", "model", client=client)
+    worker.url = api_server.url
+    results = {}
+    metrics = []
+    worker.completionReady.connect(results.__setitem__)
+    worker.requestMetrics.connect(metrics.append)
+
+    started = time.perf_counter()
+    request_ids = [worker.submit_prompt(f"question {i}", model=f"model-{i % 2}") for i in range(6)]
+    assert _wait(qapp, lambda: len(results) == 6 and len(metrics) == 6)
+    elapsed = time.perf_counter() - started
+
+    assert sorted(results) == sorted(request_ids)
+    assert all(result[1] == "success" for result in results.values())
+    assert api_server.max_active == 3
+    # Шесть запросов по 0.2 с при трех слотах - два "раунда", а не шесть
+    assert elapsed < 6 * 0.2
+    assert {item["model"] for item in metrics} == {"model-0", "model-1"}
+    # Независимые запросы не меняют контекст диалога
+    assert [message["role"] for message in worker.dialogs] == ["system"]
+
+
+def test_submit_prompt_reports_errors(qapp, client, api_server):
+    api_server.statuses = [(500, None)]
+    worker = ModelWorker("key", "model", client=client)
+    worker.url = api_server.url
+    results = []
+    worker.completionReady.connect(lambda request_id, result: results.append(result))
+
+    worker.submit_prompt("question")
+    assert _wait(qapp, lambda: results)
+    assert results[0][1] == "error"
+    assert "500" in results[0][0]
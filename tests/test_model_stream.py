@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vendor.components.ai_model_manager import ModelClient, ModelWorker
+
+CHUNKS = ["Привет", ", ", "мир", " 👋", "!"]
+
+
+class SSEHandler(BaseHTTPRequestHandler):
+    """Заменитель OpenRouter: отдает ответ фрагментами SSE с паузой между ними"""
+    protocol_version = "HTTP/1.1"
+    delay = 0.05
+
+    def do_POST(self):
+        self.server.requests.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        mode = self.server.mode
+        self.send_response(200)
+        # Как у OpenRouter: charset не указан, декодирование - на стороне клиента
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._send(": OPENROUTER PROCESSING\n\n")
+        if mode == "error":
+            self._send("data: " + json.dumps({"error": {"message": "rate limited"}}) + "\n\n")
+        else:
+            for chunk in CHUNKS:
+                time.sleep(self.delay)
+                event = {"choices": [{"delta": {"content": chunk}}]}
+                self._send("data: " + json.dumps(event, ensure_ascii=False) + "\n\n")
+            self._send("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.close_connection = True
+
+    def _send(self, text):
+        # Каждое событие уходит отдельным фрагментом chunked-ответа, как у настоящего API
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sse_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SSEHandler)
+    server.requests = []
+    server.mode = "ok"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def worker(sse_server):
+    client = ModelClient()
+    worker = ModelWorker("test-key", "test/model", client=client)
+    worker.url = f"http://127.0.0.1:{sse_server.server_port}/api/v1/chat/completions"
+    yield worker
+    client.close()
+
+
+class Recorder:
+    def __init__(self, worker):
+        self.started = time.perf_counter()
+        self.chunks = []
+        self.chunk_times = []
+        self.responses = []
+        self.errors = []
+        self.statuses = []
+        self.metrics = []
+        worker.chunkReady.connect(self.on_chunk)
+        worker.responseReady.connect(self.responses.append)
+        worker.errorOccurred.connect(self.errors.append)
+        worker.statusChanged.connect(self.statuses.append)
+        worker.requestMetrics.connect(self.metrics.append)
+
+    def on_chunk(self, chunk):
+        self.chunks.append(chunk)
+        self.chunk_times.append(time.perf_counter() - self.started)
+
+
+def test_stream_emits_chunks_and_full_reply(worker, sse_server):
+    recorder = Recorder(worker)
+    worker.set_prompt("hi")
+    worker.response()
+
+    assert recorder.errors == []
+    assert recorder.chunks == CHUNKS
+    assert recorder.responses == [["".join(CHUNKS), "success"]]
+    assert sse_server.requests[0]["stream"] is True
+    # Ответ ассистента попадает в контекст следующего запроса
+    assert worker.dialogs[-1] == {"role": "assistant", "content": "".join(CHUNKS)}
+
+
+def test_first_token_arrives_before_generation_ends(worker):
+    recorder = Recorder(worker)
+    worker.set_prompt("hi")
+    worker.response()
+
+    first_token = recorder.chunk_times[0]
+    total = recorder.metrics[0]["latency"]
+    assert first_token < total / 2
+    assert recorder.metrics[0]["first_byte"] < first_token
+
+
+def test_stream_error_event(worker, sse_server):
+    sse_server.mode = "error"
+    recorder = Recorder(worker)
+    worker.set_prompt("hi")
+    worker.response()
+
+    assert recorder.responses == []
+    assert recorder.errors and "rate limited" in recorder.errors[0]
+
+
+def test_cancel_mid_stream(worker):
+    recorder = Recorder(worker)
+    worker.chunkReady.connect(lambda chunk: worker.cancel() if len(recorder.chunks) == 2 else None)
+    worker.set_prompt("hi")
+    worker.response()
+
+    assert recorder.chunks == CHUNKS[:2]
+    assert recorder.responses == [["".join(CHUNKS[:2]), "success"]]
+    assert "Generation cancelled" in recorder.statuses
+
+
+def test_cancel_before_request_starts(worker, sse_server):
+    recorder = Recorder(worker)
+    worker.set_prompt("hi")
+    worker.cancel()
+    worker.response()
+
+    assert sse_server.requests == []
+    assert recorder.responses == [["", "success"]]
+    assert "Generation cancelled" in recorder.statuses
+
+
+def test_new_prompt_resets_cancel(worker, sse_server):
+    worker.cancel()
+    recorder = Recorder(worker)
+    worker.set_prompt("hi")
+    worker.response()
+
+    assert recorder.chunks == CHUNKS
+    assert len(sse_server.requests) == 1
@@ -0,0 +1,86 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from vendor.components import screen_capture
+from vendor.components.screen_capture import FrameRing, ScreenCapture
+
+WIDTH, HEIGHT = 64, 36
+
+
+@pytest.fixture
+def fake_screen(monkeypatch):
+    """Заменитель mss: кадр номер n залит значением n % 256"""
+    screen = SimpleNamespace(grabs=0)
+
+    class FakeMss:
+        monitors = [None, {"left": 0, "top": 0, "width": WIDTH, "height": HEIGHT}]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def grab(self, area):
+            screen.grabs += 1
+            return np.full((area["height"], area["width"], 4), screen.grabs % 256, dtype=np.uint8)
+
+    monkeypatch.setattr(screen_capture, "mss", SimpleNamespace(mss=FakeMss))
+    return screen
+
+
+def test_ring_drops_oldest_and_keeps_latest():
+    ring = FrameRing(4, WIDTH, HEIGHT)
+    for i in range(1, 11):
+        _, frame = ring.reserve()
+        frame[:] = i
+        ring.commit(float(i))
+
+    assert len(ring) == 4
+    assert ring.dropped == 6
+    out = np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    popped = []
+    while (timestamp := ring.pop(out, timeout=0)) is not None:
+        assert np.all(out == int(timestamp))
+        popped.append(timestamp)
+    assert popped == [7.0, 8.0, 9.0, 10.0]
+
+
+def test_slow_consumer_gets_latest_frames(fake_screen):
+    ring = FrameRing(4, WIDTH, HEIGHT)
+    capture = ScreenCapture(ring, fps=200)
+    capture.start()
+    # Потребитель "занят": захват успевает переполнить кольцо
+    while fake_screen.grabs < 40:
+        time.sleep(0.005)
+    capture.stop()
+    capture.join(timeout=2)
+
+    assert capture.error is None
+    assert capture.captured == fake_screen.grabs
+    assert ring.dropped == capture.captured - ring.capacity
+    out = np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    values, timestamps = [], []
+    while (timestamp := ring.pop(out, timeout=0)) is not None:
+        values.append(int(out[0, 0, 0]))
+        timestamps.append(timestamp)
+    last = capture.captured
+    assert values == [n % 256 for n in range(last - 3, last + 1)]
+    assert timestamps == sorted(timestamps)
+
+
+def test_elapsed_frozen_after_stop(fake_screen):
+    capture = ScreenCapture(FrameRing(4, WIDTH, HEIGHT), fps=100)
+    assert capture.elapsed == 0.0
+    capture.start()
+    time.sleep(0.1)
+    capture.stop()
+    capture.join(timeout=2)
+
+    elapsed = capture.elapsed
+    assert 0.05 < elapsed < 1.0
+    time.sleep(0.1)
+    assert capture.elapsed == elapsed
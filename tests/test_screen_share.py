@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import requests
+
+from vendor.components import perf, screesharewindow
+from vendor.components.screesharewindow import ScreenShareWindow
+
+
+@pytest.fixture
+def fake_screen(monkeypatch):
+    """Заменитель mss: каждый захват - новый кадр; screen.fail_after - номер захвата с ошибкой"""
+    screen = SimpleNamespace(grabs=0, fail_after=None)
+
+    class FakeMss:
+        monitors = [None, {"left": 0, "top": 0, "width": 320, "height": 180}]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def grab(self, monitor):
+            screen.grabs += 1
+            if screen.fail_after is not None and screen.grabs > screen.fail_after:
+                raise OSError("Экран недоступен")
+            return np.full((monitor["height"], monitor["width"], 4), screen.grabs % 256, dtype=np.uint8)
+
+    monkeypatch.setattr(screesharewindow, "mss", SimpleNamespace(mss=FakeMss))
+    return screen
+
+
+@pytest.fixture
+def window(qapp, theme_manager, fake_screen, monkeypatch):
+    monkeypatch.setattr(ScreenShareWindow, "STREAM_PORT", 0)
+    window = ScreenShareWindow(theme_manager, defaultdict(str))
+    perf.reset()
+    yield window
+    if window.server:
+        window.stop_streaming()
+    window.deleteLater()
+
+
+def _feed_url(window):
+    return f"http://127.0.0.1:{window.server.server_port}/video_feed"
+
+
+def _watch(url, duration, frames, index, closed):
+    # Клиент читает поток duration секунд и считает полученные кадры
+    with requests.get(url, stream=True, timeout=5) as response:
+        deadline = time.monotonic() + duration
+        for chunk in response.iter_content(64 * 1024):
+            frames[index] += chunk.count(b"--frame")
+            if time.monotonic() > deadline:
+                return
+    closed[index] = True
+
+
+@pytest.mark.parametrize("clients", [1, 8])
+def test_capture_once_per_frame_for_any_number_of_clients(window, fake_screen, clients):
+    window.start_streaming()
+    broadcaster = window.broadcaster
+    frames = [0] * clients
+    closed = [False] * clients
+    duration = 1.0
+
+    threads = [
+        threading.Thread(target=_watch, args=(_feed_url(window), duration, frames, i, closed))
+        for i in range(clients)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    elapsed = time.monotonic() - started
+    window.stop_streaming()
+
+    assert broadcaster.error is None
+    assert all(count >= 5 for count in frames)
+    # Частота захвата задается fps трансляции, а не числом зрителей
+    assert fake_screen.grabs <= ScreenShareWindow.STREAM_FPS * elapsed + 3
+    assert broadcaster.encoded_frames + broadcaster.unchanged_frames <= fake_screen.grabs
+    assert perf.snapshot()["spans"]["screenshare.encode"]["count"] == broadcaster.encoded_frames
+    # Один закодированный кадр уходит всем клиентам
+    assert sum(frames) > broadcaster.encoded_frames * clients * 0.5
+
+
+def test_capture_error_closes_client_connections(window, fake_screen):
+    fake_screen.fail_after = 5
+    window.start_streaming()
+    broadcaster = window.broadcaster
+    frames = [0] * 3
+    closed = [False] * 3
+
+    threads = [
+        threading.Thread(target=_watch, args=(_feed_url(window), 10, frames, i, closed)) for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert all(closed)
+    assert isinstance(broadcaster.error, OSError)
+    assert broadcaster.stop_event.is_set()
+    assert broadcaster.clients == 0
+    # Новые зрители получают 503, а не висящее соединение
+    response = requests.get(_feed_url(window), timeout=5)
+    assert response.status_code == 503
+
+
+def test_feed_without_broadcaster_returns_503(window):
+    assert window.video_feed().status_code == 503
+
+    window.start_streaming()
+    url = _feed_url(window)
+    window.stop_server()
+    assert window.broadcaster is None
+    assert window.video_feed().status_code == 503
+    with pytest.raises(requests.ConnectionError):
+        requests.get(url, timeout=2)
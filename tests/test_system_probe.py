@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+
+import pytest
+
+from vendor.components.pcinfowindow import PCInfoWindow
+from vendor.components.system_probe import SystemProbe
+
+
+class Translations(dict):
+    # Вместо перевода - сам ключ: в тексте окна видно, какая подпись показана
+    def __missing__(self, key):
+        return key
+
+
+@pytest.fixture
+def release():
+    """Событие, которого ждут "зависшие" источники; освобождает потоки пула после теста"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def sources(monkeypatch, release, tmp_path):
+    calls = {}
+
+    def source(key, value, delay=0.0, hang=False):
+        def probe():
+            calls[key] = calls.get(key, 0) + 1
+            if hang:
+                release.wait()
+            elif delay:
+                time.sleep(delay)
+            return value
+        return probe
+
+    slow = {
+        "pc_name": (source("pc_name", "test-pc", delay=0.5), 2, False),
+        "os": (source("os", "TestOS 1.0", delay=0.5), 3, True),
+        "cpu": (source("cpu", "Test CPU", hang=True), 0.2, True),
+        "gpu": (source("gpu", "Test GPU", delay=0.5), 0.2, True),
+        "ram": (source("ram", {"total": 16 * 1024 ** 3, "used": 8 * 1024 ** 3, "percent": 50}), 2, False),
+        "cpu_load": (source("cpu_load", 12.0), 2, False),
+        "local_ip": (source("local_ip", "10.0.0.2"), 3, False),
+        "public_ip": (source("public_ip", None, hang=True), 0.2, False),
+        "disks": (source("disks", [], hang=True), 0.2, False),
+    }
+    monkeypatch.setattr(SystemProbe, "SOURCES", slow)
+    # Окно берет кэш по относительному пути vendor/data
+    monkeypatch.chdir(tmp_path)
+    return calls
+
+
+def _process_until(qapp, condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+@pytest.fixture
+def open_window(qapp, theme_manager, sources):
+    windows = []
+
+    def open_window():
+        started = time.perf_counter()
+        window = PCInfoWindow(theme_manager, Translations())
+        window.show()
+        qapp.processEvents()
+        window.open_time = time.perf_counter() - started
+        windows.append(window)
+        return window
+
+    yield open_window
+    for window in windows:
+        window.cleanup()
+        window.deleteLater()
+    qapp.processEvents()
+
+
+def test_window_is_interactive_before_probes_finish(open_window, sources):
+    open_window().cleanup()     # первый виджет прогревает шрифты и стили Qt
+    window = open_window()
+
+    assert window.open_time < 0.1
+    assert window.isVisible()
+    assert "loading" in window.system_info_label.text()
+    assert sources["cpu"] >= 1
+
+
+def test_timeout_falls_back_to_placeholder(qapp, open_window):
+    window = open_window()
+
+    assert _process_until(qapp, lambda: {"cpu", "gpu", "public_ip"} <= set(window._info))
+    assert window._info["cpu"] == "unknown"
+    assert window._info["public_ip"] == "ip_error"
+    assert window.disk_table.item(0, 0).text() == "no_disk_info"
+    # Быстрые источники показаны, медленные пришли позже своего таймаута и отброшены
+    assert window._info["local_ip"] == "10.0.0.2"
+    assert _process_until(qapp, lambda: "os" in window._info)
+    time.sleep(0.4)
+    qapp.processEvents()
+    assert window._info["gpu"] == "unknown"
+    assert "gpu" not in window.probe._cache
+
+
+def _probe_all(qapp, probe, keys):
+    results = {}
+    probe.resultReady.connect(results.__setitem__)
+    probe.start(keys)
+    assert _process_until(qapp, lambda: set(keys) <= set(results))
+    return results
+
+
+def test_static_facts_cached_on_disk(qapp, sources, tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    probe = SystemProbe(cache_file)
+    assert _probe_all(qapp, probe, ["os", "local_ip"]) == {"os": "TestOS 1.0", "local_ip": "10.0.0.2"}
+    probe.shutdown()
+
+    with open(cache_file, encoding="utf-8") as f:
+        cache = json.load(f)
+    assert set(cache) == {"os"}     # меняющиеся значения на диск не пишутся
+
+    # Свежий кэш: источник не вызывается, значение приходит сразу
+    probe = SystemProbe(cache_file)
+    assert _probe_all(qapp, probe, ["os", "local_ip"])["os"] == "TestOS 1.0"
+    assert sources["os"] == 1
+    assert sources["local_ip"] == 2
+    probe.shutdown()
+
+    # Через сутки запись устаревает: источник опрашивается снова, кэш обновляется
+    cache["os"]["time"] -= SystemProbe.CACHE_TTL + 1
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    probe = SystemProbe(cache_file)
+    _probe_all(qapp, probe, ["os"])
+    probe.shutdown()
+    assert sources["os"] == 2
+    with open(cache_file, encoding="utf-8") as f:
+        assert time.time() - json.load(f)["os"]["time"] < 60
+
+
+def test_hanging_probe_not_restarted(qapp, sources, tmp_path):
+    probe = SystemProbe(str(tmp_path / "cache.json"))
+    errors = []
+    probe.errorOccurred.connect(lambda key, error: errors.append((key, error)))
+
+    probe.start(["public_ip"])
+    assert _process_until(qapp, lambda: errors)
+    probe.start(["public_ip"])
+    probe.start(["public_ip"])
+    qapp.processEvents()
+    probe.shutdown()
+
+    assert errors == [("public_ip", "timeout")]
+    assert sources["public_ip"] == 1
@@ -0,0 +1,44 @@
+import time
+
+import psutil
+
+from thememanager import ThemeManager
+
+
+def _process_until(qapp, condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def test_stop_ends_watcher_without_child_processes(qapp):
+    children = {child.pid for child in psutil.Process().children(recursive=True)}
+    manager = ThemeManager()
+    started = time.perf_counter()
+    manager.stop()
+
+    assert time.perf_counter() - started < 1
+    assert not manager._watcher.is_alive()
+    assert {child.pid for child in psutil.Process().children(recursive=True)} <= children
+
+
+def test_polling_reports_system_theme_change(qapp, monkeypatch):
+    monkeypatch.setattr(ThemeManager, "POLL_INTERVAL", 0.02)
+    monkeypatch.setattr(ThemeManager, "get_system_theme", lambda self: system[0])
+    system = ["light"]
+    manager = ThemeManager()
+    changes = []
+    manager.theme_changed.connect(changes.append)
+    try:
+        system[0] = "dark"
+        assert _process_until(qapp, lambda: changes)
+        assert manager.current_theme() == "dark"
+        # Тема, выбранная вручную, не сбрасывается, пока тема ОС та же
+        manager.set_theme("light")
+        time.sleep(0.1)
+        qapp.processEvents()
+        assert changes == ["dark", "light"]
+    finally:
+        manager.stop()
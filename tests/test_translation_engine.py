@@ -0,0 +1,168 @@
+import time
+
+import pytest
+
+from vendor.components.translation_engine import TranslationCache, TranslationEngine
+from vendor.components.tranlatorwindow import TranslatorWindow
+
+
+class Translations(dict):
+    def __missing__(self, key):
+        return key
+
+
+def _process_until(qapp, condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def _expected(chunks, dest):
+    return "".join((f"{dest}:{chunk.upper()}" if chunk.strip() else chunk) + separator for chunk, separator in chunks)
+
+
+@pytest.fixture
+def engine(qapp, translation_backend, tmp_path):
+    engine = TranslationEngine(translation_backend, cache_file=str(tmp_path / "cache.json"))
+    results = {}
+    engine.translated.connect(lambda request_id, text, lang: results.__setitem__(request_id, (text, lang)))
+    engine.failed.connect(lambda request_id, error: results.__setitem__(request_id, ("error", error)))
+    engine.results = results
+    yield engine
+    engine.shutdown()
+
+
+def _translate(qapp, engine, text, dest="de"):
+    request_id = engine.translate(text, dest)
+    assert _process_until(qapp, lambda: request_id in engine.results)
+    return engine.results[request_id]
+
+
+def test_split_chunks_reassembles_text(monkeypatch):
+    monkeypatch.setattr(TranslationEngine, "CHUNK_SIZE", 40)
+    text = "\n".join([
+        "короткая строка",
+        "",
+        "очень длинная строка из многих слов, которую придется резать по пробелам " * 3,
+        "x" * 100,
+        "хвост",
+    ])
+    chunks = TranslationEngine.split_chunks(text)
+
+    assert all(len(chunk) <= 40 for chunk, _ in chunks)
+    assert all(separator in ("", " ", "\n") for _, separator in chunks)
+    assert TranslationEngine._join(chunks, [chunk for chunk, _ in chunks]) == text
+    assert chunks[-1][1] == ""
+
+
+def test_split_chunks_keeps_short_text_whole():
+    text = "первая строка\nвторая строка"
+    assert TranslationEngine.split_chunks(text) == [(text, "")]
+    assert TranslationEngine.split_chunks("") == [("", "")]
+
+
+def test_translates_chunks_and_reuses_cache(qapp, engine, translation_backend, monkeypatch):
+    monkeypatch.setattr(TranslationEngine, "CHUNK_SIZE", 30)
+    text = "\n".join(f"строка номер {i} для перевода" for i in range(6))
+    chunks = TranslationEngine.split_chunks(text)
+    assert len(chunks) == 6
+
+    assert _translate(qapp, engine, text) == (_expected(chunks, "de"), "ru")
+    assert len(translation_backend.calls) == 6
+    assert translation_backend.detects == 1
+    assert translation_backend.max_active <= TranslationEngine.MAX_CONCURRENT
+
+    # Повтор целиком из кэша: результат приходит сразу, без потока движка
+    request_id = engine.translate(text, "de")
+    assert engine.results[request_id] == (_expected(chunks, "de"), "ru")
+    assert len(translation_backend.calls) == 6
+
+    # Правка одной строки переводит заново только ее часть
+    edited = text.replace("строка номер 3", "строка номер 33")
+    text_de, _ = _translate(qapp, engine, edited)
+    assert text_de == _expected(TranslationEngine.split_chunks(edited), "de")
+    assert translation_backend.calls[6:] == ["строка номер 33 для перевода"]
+    assert translation_backend.detects == 1
+
+    # Другой язык - другие ключи кэша
+    _translate(qapp, engine, text, dest="fr")
+    assert len(translation_backend.calls) == 13
+
+
+def test_disk_cache_survives_restart(qapp, translation_backend, tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    engine = TranslationEngine(translation_backend, cache_file=cache_file)
+    results = []
+    engine.translated.connect(lambda request_id, text, lang: results.append(text))
+    engine.translate("hello world", "de")
+    assert _process_until(qapp, lambda: results)
+    engine.shutdown()
+
+    calls = len(translation_backend.calls)
+    engine = TranslationEngine(translation_backend, cache_file=cache_file)
+    engine.translated.connect(lambda request_id, text, lang: results.append(text))
+    engine.translate("hello world", "de")
+    assert _process_until(qapp, lambda: len(results) == 2)
+    engine.shutdown()
+
+    assert results[1] == "de:HELLO WORLD"
+    assert len(translation_backend.calls) == calls
+
+
+def test_cache_memory_lru_and_disk_limit(tmp_path):
+    value = {"text": "x" * 100, "lang": "en"}
+    cache = TranslationCache(str(tmp_path / "cache.json"), memory_size=2, disk_limit=600)
+    keys = [TranslationCache.key(f"text {i}", "auto", "de") for i in range(6)]
+    for key in keys[:3]:
+        cache.put(key, value)
+
+    assert list(cache._memory) == keys[1:3]
+    # Вытесненная из памяти запись читается с диска и снова становится свежей
+    assert cache.get(keys[0]) == value
+    assert list(cache._memory) == [keys[2], keys[0]]
+
+    for key in keys[3:]:
+        cache.put(key, value)
+    assert cache._disk_bytes <= 600
+    assert keys[0] not in cache._disk
+    assert keys[5] in cache._disk
+
+    cache.save()
+    reloaded = TranslationCache(cache.cache_file, disk_limit=600)
+    reloaded.load()
+    assert list(reloaded._disk) == list(cache._disk)
+    assert reloaded._disk_bytes == cache._disk_bytes
+
+
+@pytest.fixture
+def translator(qapp, theme_manager, translation_backend, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    window = TranslatorWindow(theme_manager, Translations(), backend=translation_backend)
+    yield window
+    window.cleanup()
+    window.deleteLater()
+
+
+def test_typing_debounce_and_stale_request_cancelled(qapp, translator, translation_backend):
+    translation_backend.delay = 0.3
+    translator.input_text.setPlainText("first")
+    time.sleep(0.3)
+    qapp.processEvents()
+    translator.input_text.setPlainText("second")
+    started = time.monotonic()
+
+    # Пока пользователь печатает, запросов нет
+    assert _process_until(qapp, lambda: translation_backend.calls, timeout=2)
+    assert time.monotonic() - started >= TranslatorWindow.TYPING_DELAY / 1000 - 0.05
+    assert translation_backend.calls == ["second"]
+
+    # Новый ввод во время перевода отменяет устаревший запрос
+    translator.input_text.setPlainText("third")
+    translator.translate_text()
+    assert _process_until(qapp, lambda: translator.output_text.toPlainText())
+    assert translator.output_text.toPlainText().endswith(":THIRD")
+    assert translation_backend.calls == ["second", "third"]
+    assert _process_until(qapp, lambda: translation_backend.cancelled == 1)
+    assert not translator.typing_timer.isActive()
@@ -1,11 +1,14 @@
 import darkdetect
 from PyQt6.QtWidgets import QPushButton
 from PyQt6.QtGui import QPixmap, QIcon, QCursor
-from PyQt6.QtCore import Qt, QObject, pyqtSignal, QTimer, QSize
+from PyQt6.QtCore import Qt, QObject, pyqtSignal, QSize
 import platform
+import threading
 
 class ThemeManager(QObject):
     theme_changed = pyqtSignal(str)  # Сигнал с новой темой: 'light' или 'dark'
+    _system_theme_detected = pyqtSignal(str)
+    POLL_INTERVAL = 2  # секунд между проверками темы ОС
 
     def __init__(self):
         super().__init__()
@@ -33,12 +36,28 @@ class ThemeManager(QObject):
                 "fg_message": "#000000",  #
             }
         }
-        self._theme = self.get_system_theme()
-        
-        # Таймер для периодической проверки изменения темы
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.check_system_theme)  # Проверяем каждую секунду
-        self.timer.start(1000)  # Интервал в миллисекундах (1000 ms = 1 секунда)
+        self._system_theme = self.get_system_theme()
+        self._theme = self._system_theme
+        self._stylesheets = {}  # (имя, тема) -> скомпилированный QSS
+
+        # Тема ОС отслеживается в фоновом потоке, результат приходит в GUI-поток сигналом
+        self._stop_event = threading.Event()
+        self._system_theme_detected.connect(self.check_system_theme)
+        self._watcher = threading.Thread(target=self._watch_system_theme, name="theme-watcher", daemon=True)
+        self._watcher.start()
+
+    def _watch_system_theme(self):
+        # Только опрос: darkdetect.listener блокируется навсегда, не реагирует на stop()
+        # и в Linux оставляет дочерний процесс gsettings monitor
+        while not self._stop_event.wait(self.POLL_INTERVAL):
+            theme = self.get_system_theme()
+            if theme != self._system_theme:
+                self._system_theme_detected.emit(theme)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._watcher.is_alive() and self._watcher is not threading.current_thread():
+            self._watcher.join(timeout=1)
 
     def set_theme(self, theme: str):
         if theme != self._theme:
@@ -50,15 +69,35 @@ class ThemeManager(QObject):
     
     def get_system_theme(self):
         try:
-            return str(darkdetect.theme()).lower()
+            theme = str(darkdetect.theme()).lower()
         except:
             return "light"
+        return theme if theme in self.theme_palette else "light"
 
-    def check_system_theme(self):
-        new_theme = self.get_system_theme()
-        if new_theme != self._theme:
+    def check_system_theme(self, new_theme=None):
+        # Тема, выбранная вручную, меняется только при реальной смене темы ОС
+        new_theme = new_theme if new_theme in self.theme_palette else self.get_system_theme()
+        if new_theme != self._system_theme:
+            self._system_theme = new_theme
             self.set_theme(new_theme)
 
+    def stylesheet(self, name, builder, theme=None):
+        """QSS окна для темы: builder(palette) вызывается один раз, дальше строка берется из кэша"""
+        theme = theme or self._theme
+        key = (name, theme)
+        stylesheet = self._stylesheets.get(key)
+        if stylesheet is None:
+            stylesheet = builder(self.theme_palette[theme])
+            self._stylesheets[key] = stylesheet
+        return stylesheet
+
+    def apply_stylesheet(self, widget, name, builder, theme=None):
+        """Ставит QSS на окно верхнего уровня; тот же QSS повторно не ставится,
+        чтобы не запускать перерасчет стилей всего дерева виджетов"""
+        stylesheet = self.stylesheet(name, builder, theme)
+        if widget.styleSheet() != stylesheet:
+            widget.setStyleSheet(stylesheet)
+
     def get_current_platform(self):
         return str(platform.system()).lower()
 